@@ -9,11 +9,13 @@ Measures throughput, latency, error rates under sustained load.
 Usage:
     python aws_load_test.py --endpoint <AWS-ALB-URL> --test search --concurrent 10 --duration 60
     python aws_load_test.py --endpoint <AWS-ALB-URL> --test batch --requests 100
+    python aws_load_test.py --endpoint <AWS-ALB-URL> --test batch --requests 100 --batch-concurrent 4
     python aws_load_test.py --endpoint <AWS-ALB-URL> --test all --output load_test_results.json
 """
 
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import csv
 import time
@@ -60,10 +62,18 @@ class TestResult:
 class WatchmanLoadTester:
     """Load tester for Watchman Java API"""
 
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, pool_size: int = 10):
         self.base_url = base_url.rstrip('/')
         self.results: List[TestResult] = []
         
+        # Shared keep-alive session so requests reuse pooled connections
+        # instead of paying a TCP/TLS handshake each time. No retries:
+        # failures must show up in the results.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
         # Test data sets - realistic 1-2% match rate
         # SDN matches (for positive hits)
         self.SDN_NAMES = [
@@ -146,7 +156,7 @@ class WatchmanLoadTester:
             
             req_start = time.time()
             try:
-                response = requests.get(url, params=params, timeout=90)
+                response = self.session.get(url, params=params, timeout=90)
                 latency_ms = (time.time() - req_start) * 1000
                 
                 if response.status_code == 200:
@@ -162,7 +172,7 @@ class WatchmanLoadTester:
 
         # Run load test until duration expires
         with ThreadPoolExecutor(max_workers=concurrent_users) as executor:
-            futures = []
+            futures = set()
             query_index = 0
             last_progress_log = time.time()
             
@@ -170,7 +180,7 @@ class WatchmanLoadTester:
                 # Submit new request
                 query = self.SEARCH_QUERIES[query_index % len(self.SEARCH_QUERIES)]
                 future = executor.submit(make_search_request, query)
-                futures.append(future)
+                futures.add(future)
                 query_index += 1
                 
                 # Process completed requests
@@ -240,15 +250,17 @@ class WatchmanLoadTester:
         self.results.append(result)
         return result
 
-    def test_batch_endpoint(self, num_requests: int, batch_size: int = 10) -> TestResult:
+    def test_batch_endpoint(self, num_requests: int, batch_size: int = 10,
+                            concurrent_requests: int = 1) -> TestResult:
         """
         Load test the /v1/search/batch endpoint.
         
         Args:
             num_requests: Number of batch requests to send
             batch_size: Number of items per batch
+            concurrent_requests: Number of batch requests in flight at once
         """
-        logger.info(f"Starting batch endpoint load test: {num_requests} requests, {batch_size} items per batch")
+        logger.info(f"Starting batch endpoint load test: {num_requests} requests, {batch_size} items per batch, {concurrent_requests} concurrent")
         
         latencies = []
         successful = 0
@@ -256,24 +268,29 @@ class WatchmanLoadTester:
         errors: Dict[str, int] = {}
         start_time = time.time()
         
+        url = f"{self.base_url}/v1/search/batch"
+        
+        # Use fixed test items, cycle if batch_size > available
+        items = [self.BATCH_TEST_ITEMS[i % len(self.BATCH_TEST_ITEMS)] 
+                 for i in range(batch_size)]
+        
+        payload = {
+            "items": items,
+            "minMatch": 0.88,
+            "limit": 10,
+            "trace": False
+        }
+        
+        # Every request sends the same payload, so serialize it once up front
+        # rather than inside the timed section of each request
+        body = json.dumps(payload)
+        headers = {"Content-Type": "application/json"}
+        
         def make_batch_request() -> Tuple[bool, float, str]:
             """Make a single batch request. Returns (success, latency_ms, error_msg)"""
-            url = f"{self.base_url}/v1/search/batch"
-            
-            # Use fixed test items, cycle if batch_size > available
-            items = [self.BATCH_TEST_ITEMS[i % len(self.BATCH_TEST_ITEMS)] 
-                     for i in range(batch_size)]
-            
-            payload = {
-                "items": items,
-                "minMatch": 0.88,
-                "limit": 10,
-                "trace": False
-            }
-            
             req_start = time.time()
             try:
-                response = requests.post(url, json=payload, timeout=180)
+                response = self.session.post(url, data=body, headers=headers, timeout=180)
                 latency_ms = (time.time() - req_start) * 1000
                 
                 if response.status_code == 200:
@@ -287,19 +304,22 @@ class WatchmanLoadTester:
                 latency_ms = (time.time() - req_start) * 1000
                 return False, latency_ms, str(e)
 
-        # Execute batch requests sequentially (batch is already heavy)
-        for i in range(num_requests):
-            success, latency, error = make_batch_request()
-            latencies.append(latency)
+        # Execute batch requests (sequential by default, batch is already heavy)
+        with ThreadPoolExecutor(max_workers=concurrent_requests) as executor:
+            futures = [executor.submit(make_batch_request) for _ in range(num_requests)]
             
-            if success:
-                successful += 1
-            else:
-                failed += 1
-                errors[error] = errors.get(error, 0) + 1
-            
-            if (i + 1) % 10 == 0:
-                logger.info(f"Progress: {i + 1}/{num_requests} batch requests completed")
+            for i, future in enumerate(as_completed(futures)):
+                success, latency, error = future.result()
+                latencies.append(latency)
+                
+                if success:
+                    successful += 1
+                else:
+                    failed += 1
+                    errors[error] = errors.get(error, 0) + 1
+                
+                if (i + 1) % 10 == 0:
+                    logger.info(f"Progress: {i + 1}/{num_requests} batch requests completed")
 
         actual_duration = time.time() - start_time
         total_requests = successful + failed
@@ -314,7 +334,7 @@ class WatchmanLoadTester:
         )
         
         result = TestResult(
-            test_name=f"Batch Endpoint Load Test (batch_size={batch_size})",
+            test_name=f"Batch Endpoint Load Test (batch_size={batch_size}, concurrent={concurrent_requests})",
             endpoint=f"{self.base_url}/v1/search/batch",
             total_requests=total_requests,
             successful_requests=successful,
@@ -333,7 +353,7 @@ class WatchmanLoadTester:
         """Test the health endpoint to verify service is operational"""
         url = f"{self.base_url}/v1/health"
         try:
-            response = requests.get(url, timeout=10)
+            response = self.session.get(url, timeout=10)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -345,17 +365,17 @@ class WatchmanLoadTester:
 
     def generate_report(self) -> str:
         """Generate human-readable report"""
-        report = f"""
+        parts = [f"""
 AWS WATCHMAN JAVA LOAD TEST REPORT
 ===================================
 Generated: {datetime.now().isoformat()}
 Base URL: {self.base_url}
 
-"""
+"""]
         for result in self.results:
             success_rate = (result.successful_requests / result.total_requests * 100) if result.total_requests > 0 else 0
             
-            report += f"""
+            parts.append(f"""
 {result.test_name}
 {'-' * len(result.test_name)}
 Endpoint:           {result.endpoint}
@@ -372,13 +392,13 @@ Latency Statistics (ms):
   Median:   {result.latency_stats.median:.2f}
   P95:      {result.latency_stats.p95:.2f}
   P99:      {result.latency_stats.p99:.2f}
-"""
+""")
             if result.error_details:
-                report += "\nErrors:\n"
+                parts.append("\nErrors:\n")
                 for error, count in result.error_details.items():
-                    report += f"  {error}: {count}\n"
+                    parts.append(f"  {error}: {count}\n")
         
-        return report
+        return "".join(parts)
 
     def export_results(self, output_file: str, format: str = 'json'):
         """Export results to JSON or CSV file"""
@@ -454,6 +474,8 @@ def main():
                         help='Number of batch requests (default: 10)')
     parser.add_argument('--batch-size', type=int, default=1000,
                         help='Items per batch request (default: 1000)')
+    parser.add_argument('--batch-concurrent', type=int, default=1,
+                        help='Concurrent batch requests (default: 1)')
     parser.add_argument('--output', default='load_test_results',
                         help='Output file for results (without extension)')
     parser.add_argument('--format', choices=['json', 'csv', 'both'], default='both',
@@ -461,7 +483,7 @@ def main():
     
     args = parser.parse_args()
     
-    tester = WatchmanLoadTester(args.endpoint)
+    tester = WatchmanLoadTester(args.endpoint, pool_size=max(args.concurrent, args.batch_concurrent))
     
     # Health check
     logger.info("Running health check...")
@@ -477,7 +499,7 @@ def main():
         tester.test_search_endpoint(args.concurrent, args.duration)
     
     if args.test in ['batch', 'all']:
-        tester.test_batch_endpoint(args.requests, args.batch_size)
+        tester.test_batch_endpoint(args.requests, args.batch_size, args.batch_concurrent)
     
     # Generate report
     report = tester.generate_report()
@@ -36,14 +36,40 @@ See: docs/API_REFERENCE_GENERATION.md for full documentation
 
 import subprocess
 import json
+import os
 import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+
+# Matches the class/interface/record keyword of a javap declaration line
+DECLARATION_PATTERN = re.compile(r'\b(class|interface|record) ')
+CLASS_NAME_PATTERN = re.compile(r'(?:class|interface|record)\s+(\S+)')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+# Classes disassembled per javap invocation (amortizes JVM startup)
+JAVAP_BATCH_SIZE = 50
 
 
 def find_class_files(target_dir: Path) -> List[Path]:
-    """Find all compiled .class files."""
-    return list(target_dir.rglob("*.class"))
+    """Find compiled top-level .class files, skipping inner and test classes."""
+    class_files = []
+    pending = [target_dir]
+    
+    # Single scandir walk; names are filtered from the directory entries
+    while pending:
+        with os.scandir(pending.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+                elif (entry.name.endswith('.class')
+                        and '$' not in entry.name
+                        and 'Test' not in entry.name):
+                    class_files.append(Path(entry.path))
+    
+    return class_files
 
 
 def extract_class_api(class_file: Path) -> Dict:
@@ -61,48 +87,57 @@ def extract_class_api(class_file: Path) -> Dict:
         
         return parse_javap_output(result.stdout)
     except Exception as e:
-        print(f"Warning: Could not process {class_file}: {e}")
+        # Runs on worker threads: emit the line in one write so
+        # concurrent warnings don't interleave
+        sys.stdout.write(f"Warning: Could not process {class_file}: {e}\n")
         return None
 
 
+def extract_class_apis(class_files: List[Path]) -> List[Optional[Dict]]:
+    """Extract public API for a batch of .class files with one javap run.
+
+    javap prints one block per class, in argument order, each closed by a
+    '}' line. If the run fails or the blocks don't line up with the input,
+    falls back to one javap call per file.
+    """
+    try:
+        result = subprocess.run(
+            ['javap', '-public'] + [str(f) for f in class_files],
+            capture_output=True,
+            text=True,
+            timeout=60
+        )
+    except Exception:
+        result = None
+    
+    if result is not None and result.returncode == 0:
+        blocks = [b for b in result.stdout.split('\n}\n') if b.strip()]
+        if len(blocks) == len(class_files):
+            return [parse_javap_output(block) for block in blocks]
+    
+    return [extract_class_api(f) for f in class_files]
+
+
 def parse_javap_output(javap_output: str) -> Dict:
     """Parse javap output into structured API info."""
-    lines = javap_output.strip().split('\n')
-    
-    # Extract class declaration
     class_line = None
-    for line in lines:
-        if 'class ' in line or 'interface ' in line or 'record ' in line:
-            class_line = line.strip()
-            break
-    
-    if not class_line:
-        return None
-    
-    # Extract class name
-    class_name_match = re.search(r'(?:class|interface|record)\s+(\S+)', class_line)
-    if not class_name_match:
-        return None
-    
-    class_name = class_name_match.group(1)
-    
-    # Determine type
-    if 'interface ' in class_line:
-        class_type = 'interface'
-    elif 'record ' in class_line:
-        class_type = 'record'
-    else:
-        class_type = 'class'
-    
-    # Extract methods and fields
+    declaration = None
     methods = []
     fields = []
     
-    for line in lines:
+    # Single pass: the first declaration line is the class, the rest are members
+    for line in javap_output.strip().split('\n'):
         line = line.strip()
         
-        # Skip class declaration and empty lines
-        if not line or 'class ' in line or 'interface ' in line or 'record ' in line:
+        if not line:
+            continue
+        
+        # Class declaration (first one wins; later ones are skipped)
+        match = DECLARATION_PATTERN.search(line)
+        if match:
+            if declaration is None:
+                declaration = match
+                class_line = line
             continue
         
         # Skip inner class declarations
@@ -112,17 +147,30 @@ def parse_javap_output(javap_output: str) -> Dict:
         # Method signature (has parentheses)
         if '(' in line and ')' in line:
             # Clean up the signature
-            signature = re.sub(r'\s+', ' ', line)
+            signature = WHITESPACE_PATTERN.sub(' ', line)
             signature = signature.rstrip(';').strip()
             methods.append(signature)
         
         # Field declaration (no parentheses, ends with semicolon or has =)
         elif ';' in line or '=' in line:
-            field = re.sub(r'\s+', ' ', line)
+            field = WHITESPACE_PATTERN.sub(' ', line)
             field = field.rstrip(';').strip()
             if field:
                 fields.append(field)
     
+    if not class_line:
+        return None
+    
+    # Extract class name
+    class_name_match = CLASS_NAME_PATTERN.search(class_line)
+    if not class_name_match:
+        return None
+    
+    class_name = class_name_match.group(1)
+    
+    # Determine type
+    class_type = declaration.group(1)
+    
     return {
         'name': class_name,
         'type': class_type,
@@ -138,17 +186,24 @@ def generate_api_reference(target_dir: Path) -> Dict:
     
     api_reference = {}
     
-    for class_file in class_files:
+    # Each javap call is a separate JVM: batch classes per call and run
+    # the batches concurrently
+    batches = [
+        class_files[i:i + JAVAP_BATCH_SIZE]
+        for i in range(0, len(class_files), JAVAP_BATCH_SIZE)
+    ]
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 4) as executor:
+        api_infos = [
+            api_info
+            for batch_infos in executor.map(extract_class_apis, batches)
+            for api_info in batch_infos
+        ]
+    
+    for class_file, api_info in zip(class_files, api_infos):
         # Get package name from path
         relative_path = class_file.relative_to(target_dir)
         package_path = str(relative_path.parent).replace('/', '.')
         
-        # Skip inner classes and test classes
-        if '$' in class_file.name or 'Test' in class_file.name:
-            continue
-        
-        api_info = extract_class_api(class_file)
-        
         if api_info:
             full_class_name = f"{package_path}.{api_info['name']}"
             api_reference[full_class_name] = api_info
@@ -236,5 +291,4 @@ def main():
 
 
 if __name__ == '__main__':
-    import sys
     sys.exit(main())
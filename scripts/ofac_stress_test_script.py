@@ -26,7 +26,7 @@ from datetime import datetime, timedelta
 from typing import List, Dict, Tuple, Optional
 from enum import Enum
 import random
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 
 # Configure logging
 logging.basicConfig(
@@ -88,8 +88,12 @@ class TestCase:
     notes: str  # Test rationale and edge cases
 
     def to_dict(self) -> Dict:
-        """Convert to dictionary for CSV/JSON export"""
-        return asdict(self)
+        """Convert to dictionary for CSV/JSON export (enums as their values)"""
+        data = dict(self.__dict__)
+        data['category'] = self.category.value
+        data['message_type'] = self.message_type.value
+        data['expected_outcome'] = self.expected_outcome.value
+        return data
 
 
 class ScreeningTestDataGenerator:
@@ -813,24 +817,9 @@ class ScreeningTestDataGenerator:
                     'test_name', 'test_value', 'expected_outcome', 'fuzzy_threshold',
                     'description', 'sdl_list', 'notes'
                 ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
                 writer.writeheader()
-                
-                for test_case in self.test_cases:
-                    row = {
-                        'test_id': test_case.test_id,
-                        'category': test_case.category.value,
-                        'message_type': test_case.message_type.value,
-                        'field_name': test_case.field_name,
-                        'test_name': test_case.test_name,
-                        'test_value': test_case.test_value,
-                        'expected_outcome': test_case.expected_outcome.value,
-                        'fuzzy_threshold': test_case.fuzzy_threshold,
-                        'description': test_case.description,
-                        'sdl_list': test_case.sdl_list,
-                        'notes': test_case.notes
-                    }
-                    writer.writerow(row)
+                writer.writerows([test_case.to_dict() for test_case in self.test_cases])
             
             logger.info(f"CSV export successful: {output_file}")
         except Exception as e:
@@ -851,12 +840,6 @@ class ScreeningTestDataGenerator:
                 "test_cases": [test_case.to_dict() for test_case in self.test_cases]
             }
             
-            # Convert enums to strings for JSON serialization
-            for test_case in export_data['test_cases']:
-                test_case['category'] = test_case['category'].value if isinstance(test_case['category'], TestCategory) else test_case['category']
-                test_case['message_type'] = test_case['message_type'].value if isinstance(test_case['message_type'], MessageType) else test_case['message_type']
-                test_case['expected_outcome'] = test_case['expected_outcome'].value if isinstance(test_case['expected_outcome'], AlertExpectation) else test_case['expected_outcome']
-            
             with open(output_file, 'w', encoding='utf-8') as jsonfile:
                 json.dump(export_data, jsonfile, indent=2, ensure_ascii=False)
             
@@ -922,7 +905,7 @@ class ScreeningTestResults:
         passed = sum(1 for r in self.results if r['passed'])
         failed = total - passed
         
-        report = f"""
+        parts = [f"""
 OFAC SANCTIONS SCREENING SYSTEM TEST REPORT
 ============================================
 Generated: {datetime.now().isoformat()}
@@ -936,7 +919,7 @@ Success Rate:              {100*passed/total:.1f}%
 
 TEST BREAKDOWN BY CATEGORY
 --------------------------
-"""
+"""]
         category_breakdown = {}
         for result in self.results:
             cat = result['category']
@@ -949,21 +932,21 @@ TEST BREAKDOWN BY CATEGORY
         for category in sorted(category_breakdown.keys()):
             stats = category_breakdown[category]
             success_rate = 100 * stats['passed'] / stats['total']
-            report += f"{category}: {stats['passed']}/{stats['total']} ({success_rate:.1f}%)\n"
+            parts.append(f"{category}: {stats['passed']}/{stats['total']} ({success_rate:.1f}%)\n")
         
-        report += f"""
+        parts.append(f"""
 FAILED TESTS
 -----------
-"""
+""")
         failed_tests = [r for r in self.results if not r['passed']]
         if failed_tests:
             for test in failed_tests[:10]:  # Show first 10 failures
-                report += f"  - {test['test_id']}: {test['test_name']}\n"
-                report += f"    Expected: {test['expected_outcome']}, Got: Alert={test['alert_generated']}, Score={test['match_score']}\n"
+                parts.append(f"  - {test['test_id']}: {test['test_name']}\n")
+                parts.append(f"    Expected: {test['expected_outcome']}, Got: Alert={test['alert_generated']}, Score={test['match_score']}\n")
         else:
-            report += "  None - All tests passed!\n"
+            parts.append("  None - All tests passed!\n")
         
-        return report
+        return "".join(parts)
 
     def export_results(self, output_file: str, format: str = "json"):
         """Export results to file"""